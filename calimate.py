@@ -2,60 +2,318 @@
 Calimate - Automated Tektronics oscilloscope calibration
 """
 
-from PyQt5.QtWidgets import (QAbstractItemView, QApplication, QMainWindow, QTableWidget, QTableWidgetItem,
+from PyQt5.QtWidgets import (QAbstractItemView, QApplication, QMainWindow, QTableView,
                              QHBoxLayout, QVBoxLayout, QWidget, QPushButton, QFileDialog, QFrame, QSplitter,
                              QSizePolicy)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QEventLoop, QModelIndex, QObject, QRunnable, QThreadPool,
+                          QTimer, pyqtSignal)
+from PyQt5.QtGui import QFont, QColor, QBrush
 from PyQt5.QtWidgets import QTextEdit
 
 import csv
 import locale
 import json
+import logging
+import operator
 import os
 import pyvisa
 import sys
 
 # Use '' for auto, or force e.g. to 'en_US.UTF-8'
 locale.setlocale(locale.LC_ALL, '')
+# Looked up once, so formatting counts doesn't go through the locale library every time
+_THOUSANDS_SEP = locale.localeconv()['thousands_sep']
+
+
+def _fmt_count(count):
+    """
+    Format an integer count with the locale's thousands separator.
+    """
+    return f"{count:,}".replace(',', _THOUSANDS_SEP)
+
+
+logger = logging.getLogger(__name__)
+
+# Set CALIMATE_DEBUG to print detailed Calimate and pyVISA debug info to console
+if os.environ.get("CALIMATE_DEBUG"):
+    logging.basicConfig(level=logging.DEBUG)
+    pyvisa.log_to_screen(logging.DEBUG)
+    # log_to_screen() adds its own handler, don't print pyVISA records twice via the root logger
+    logging.getLogger("pyvisa").propagate = False
+
+# Semi-transparent 'Material' background colors for the Result and Notes cells
+_MSG_BRUSH = QBrush(QColor(33, 150, 243, 64))   # Indigo, for "Msg"
+_PASS_BRUSH = QBrush(QColor(76, 175, 80, 64))   # Green, for Pass
+_FAIL_BRUSH = QBrush(QColor(244, 67, 54, 64))   # Red, for Fail
+
+_ALIGN_LEFT = int(Qt.AlignLeft)
+# Table cells are read-only
+_FLAGS_RO = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+
+class CsvTableModel(QAbstractTableModel):
+    """
+    Read-only table model backed by a plain Python list of CSV rows.
+    Rows are handed to the view in batches as it scrolls, and sorting is done here on the full list.
+    """
+
+    # Number of rows made visible to the view per fetchMore() call
+    fetch_batch = 500
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.result_col = columns.index("Result")
+        self.notes_col = columns.index("Notes")
+        self.messages_count = 0
+        # Shared by every row that has no colored cells
+        self._no_colors = (None,) * len(columns)
+        self._all_rows = []
+        # Number of rows (from the start of _all_rows) exposed to the view so far
+        self._loaded = 0
+        # Background brushes for each loaded row, computed as rows are fetched
+        self._colors = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def total_rows(self):
+        return len(self._all_rows)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            # csv.reader only yields strings, so cells go to the view as-is
+            return self._all_rows[index.row()][index.column()]
+        elif role == Qt.TextAlignmentRole:
+            return _ALIGN_LEFT
+        elif role == Qt.BackgroundRole:
+            return self._colors[index.row()][index.column()]
+        return None
+
+    def flags(self, index):
+        return _FLAGS_RO if index.isValid() else Qt.NoItemFlags
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._all_rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        first = self._loaded
+        last = min(first + self.fetch_batch, len(self._all_rows))
+        if last <= first:
+            return
+
+        self.beginInsertRows(QModelIndex(), first, last - 1)
+        self._colors.extend(self._row_colors(row_data) for row_data in self._all_rows[first:last])
+        self._loaded = last
+        self.endInsertRows()
+
+    def set_rows(self, rows):
+        """
+        Replace the contents of the model with the given rows in a single reset.
+        Only the first batch is exposed to the view; the rest are fetched on demand.
+        """
+        width = len(self.columns)
+        self.beginResetModel()
+        # Pad or trim ragged rows so every row has exactly one value per column.
+        # Values beyond the table's columns are ignored, also when detecting message rows.
+        self._all_rows = [row_data if len(row_data) == width else (row_data + [""] * width)[:width]
+                          for row_data in rows]
+        self.messages_count = sum("Msg" in row_data for row_data in self._all_rows)
+        self._loaded = 0
+        self._colors = []
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort all rows, not just the loaded ones, by the given column.
+        """
+        if not 0 <= column < len(self.columns):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        # Remember which record each persistent index (e.g. the selection) points at, to follow it after sorting
+        old_indexes = self.persistentIndexList()
+        old_rows = [self._all_rows[index.row()] for index in old_indexes]
+
+        self._all_rows.sort(key=operator.itemgetter(column), reverse=order == Qt.DescendingOrder)
+        self._colors = [self._row_colors(row_data) for row_data in self._all_rows[:self._loaded]]
+
+        if old_indexes:
+            new_positions = {id(row_data): row for row, row_data in enumerate(self._all_rows)}
+            new_indexes = []
+            for index, row_data in zip(old_indexes, old_rows):
+                row = new_positions[id(row_data)]
+                # Records sorted beyond the loaded rows are no longer visible
+                new_indexes.append(self.index(row, index.column()) if row < self._loaded else QModelIndex())
+            self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _row_colors(self, row_data):
+        is_msg_row = "Msg" in row_data
+
+        result_col = self.result_col
+        result_item = row_data[result_col]
+
+        if is_msg_row:
+            colors = list(self._no_colors)
+            colors[result_col] = _MSG_BRUSH
+            colors[self.notes_col] = _MSG_BRUSH
+        elif result_item == "Pass":
+            colors = list(self._no_colors)
+            colors[result_col] = _PASS_BRUSH
+        elif result_item == "Fail":
+            colors = list(self._no_colors)
+            colors[result_col] = _FAIL_BRUSH
+        else:
+            # Neutral row, nothing to color
+            colors = self._no_colors
+
+        return colors
+
+
+def _close_inst(inst):
+    """
+    Close an instrument handle, logging rather than raising if it's already unusable.
+    """
+    try:
+        inst.close()
+    except Exception as e:
+        logger.debug("Exception closing %s: %s", inst, e)
 
-# Prints detailed pyVISA debug info to console
-pyvisa.log_to_screen()
+
+class InstProbeSignals(QObject):
+    """
+    Signals emitted by an InstProbe. They are created on the GUI thread, so connected slots run there.
+    """
+
+    found = pyqtSignal(str, str, object)
+    failed = pyqtSignal(str, str)
+    done = pyqtSignal(str)
+
+
+class InstProbe(QRunnable):
+    """
+    Query the ID of a single VISA resource on a worker thread.
+    An already open handle for the resource can be passed in to skip opening it again.
+    """
+
+    def __init__(self, rm, resource, inst=None):
+        super().__init__()
+        self.rm = rm
+        self.resource = resource
+        self.inst = inst
+        self.signals = InstProbeSignals()
+
+    def run(self):
+        inst = self.inst
+        try:
+            if inst is not None:
+                try:
+                    inst_id = inst.query("*IDN?").strip()
+                except Exception as e:
+                    # Stale handle, e.g. the instrument was power cycled; reopen it below
+                    logger.debug("%s: cached handle failed, reopening: %s", self.resource, e)
+                    _close_inst(inst)
+                    inst = None
+
+            if inst is None:
+                # Open connection to the instrument
+                inst = self.rm.open_resource(self.resource)
+                inst_id = inst.query("*IDN?").strip()
+            # TODO: Try other "ID" commands if "IDN?" returns nothing.
+
+            # Return the instrument to local control
+            # TODO: This command shoudl be retrieved from the JSON file (done later).
+            inst.write(":KEY:FORCe")  # Unlocks the remote control
+
+            # The connection is kept open (and cached by the receiver) for the next search
+            self.signals.found.emit(self.resource, inst_id, inst)
+
+        except Exception as e:
+            if inst is not None:
+                _close_inst(inst)
+            self.signals.failed.emit(self.resource, f"Exception: {e}")
+
+        finally:
+            self.signals.done.emit(self.resource)
 
 
 class MainWindow(QMainWindow):
 
     app_ver = "0.1"
-    invalid_packet_count = 0
-    messages_count = 0
-    csv_file_name = None
+    # Upper limit on concurrent instrument probes, hosts can list dozens of serial/TCPIP resources
+    max_probe_threads = 16
+    # Parsed instrument configs, keyed by path: (mtime, data)
+    _json_cache = {}
 
     def __init__(self):
         super().__init__()
 
-        print(f"Current working directory: {os.getcwd()}")
+        logger.debug("Current working directory: %s", os.getcwd())
+
+        self.invalid_packet_count = 0
+        self.messages_count = 0
+        self.csv_file_name = None
+        # Table row currently shown in the instrument view, -1 if none
+        self._last_selected_row = -1
+        # Total record count of the current import, already formatted for the status bar
+        self._total_records_str = "0"
+
+        # VISA resource manager, created on the first search and then reused, since loading the backend is slow.
+        # It isn't created here so the CSV viewer still works without a VISA backend installed.
+        self._rm = None
 
         self.setWindowTitle(f"Calimate v{MainWindow.app_ver}")
         self.resize(1050, 600)
 
         self.columns = ("Test", "Result", "Notes")
 
+        # Initialize the table model, which also does the sorting
+        self.model = CsvTableModel(self.columns, self)
+
         # Initialize the table
-        self.data_table = QTableWidget(0, len(self.columns))
-        self.data_table.setHorizontalHeaderLabels(self.columns)
+        self.data_table = QTableView()
+        self.data_table.setModel(self.model)
         # Hide the vertical header (row numbers)
         self.data_table.verticalHeader().hide()
         # Set selection mode to single row selection
         self.data_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        # Connect the sectionResized signal to adjust_row_heights
-        self.data_table.horizontalHeader().sectionResized.connect(self.adjust_row_heights)
+        # Adjust row heights once a column resize has settled, not on every pixel of the drag
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(150)
+        self._resize_timer.timeout.connect(self.adjust_row_heights)
+        self.data_table.horizontalHeader().sectionResized.connect(lambda *args: self._resize_timer.start())
+        # Only visible rows are adjusted, so rows scrolled into view, fetched later or moved by a sort need the same
+        # pass. Rows that don't wrap are left at the default height, so this never changes single-line rows.
+        self.data_table.verticalScrollBar().valueChanged.connect(lambda *args: self._resize_timer.start())
+        self.model.rowsInserted.connect(lambda *args: self._resize_timer.start())
+        self.model.layoutChanged.connect(lambda *args: self._resize_timer.start())
         if sys.platform.startswith("win"):
             self.data_table.setFont(QFont("Courier"))
         else:
             self.data_table.setFont(QFont("Monospace"))
+        # Give every row the same single-line height, so nothing is measured per row on import
+        self.data_table.verticalHeader().setDefaultSectionSize(self.data_table.fontMetrics().height() + 8)
         self.data_table.setSortingEnabled(True)
-        self.data_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.data_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.data_table.selectionModel().selectionChanged.connect(self.update_inst)
+        # Row numbers refer to different records after a reload or sort
+        self.model.modelReset.connect(self._forget_selected_row)
+        self.model.layoutChanged.connect(self._refresh_selected_row)
 
         # Create a QHBoxLayout for buttons
         self.button_layout = QHBoxLayout()
@@ -89,6 +347,12 @@ class MainWindow(QMainWindow):
         self.search_button = QPushButton("Search")
         self.search_button.clicked.connect(self.find_inst)  # Connect the button to find_inst
         self.inst_layout.addWidget(self.search_button)
+        # Instrument probes still running, keyed by resource name
+        self._inst_probes = {}
+        # Probes mostly wait on instrument I/O, so they get their own pool rather than the CPU-sized global one
+        self._probe_pool = QThreadPool(self)
+        # Open instrument handles, keyed by resource name, reused across searches
+        self._inst_cache = {}
 
         # Create a container (scroll area) for instrument buttons
         self.inst_button_container = QVBoxLayout()
@@ -147,142 +411,182 @@ class MainWindow(QMainWindow):
             if child.widget():
                 child.widget().deleteLater()
 
+        if self._rm is None:
+            try:
+                self._rm = pyvisa.ResourceManager()
+            except Exception as e:
+                error_msg = f"VISA unavailable: {e}"
+                logger.debug(error_msg)
+                self.update_status_bar(error_msg)
+                return
+
         # Now proceed with finding and listing instruments
-        rm = pyvisa.ResourceManager()
-        inst_list = rm.list_resources()
+        inst_list = self._rm.list_resources()
+
+        # Close handles of instruments that have disappeared since the last search
+        for item in set(self._inst_cache) - set(inst_list):
+            _close_inst(self._inst_cache.pop(item))
+
+        if not inst_list:
+            return
+
+        # Probe every instrument concurrently so slow ones (e.g. GPIB) don't block the GUI or each other.
+        # Searching again is disabled until all probes have reported back.
+        self.search_button.setEnabled(False)
+        # One thread per resource up to a cap, so instruments on separate interfaces are queried in parallel.
+        # Instruments sharing a bus (e.g. GPIB) are still serialized by the VISA driver.
+        self._probe_pool.setMaxThreadCount(min(len(inst_list), MainWindow.max_probe_threads))
         for item in inst_list:
-            try:
-                # Open connection to the instrument
-                inst = rm.open_resource(item)
-                inst_id = inst.query("*IDN?").strip()
-                # TODO: Try other "ID" commands if "IDN?" returns nothing.
-
-                # Return the instrument to local control
-                # TODO: This command shoudl be retrieved from the JSON file (done later).
-                inst.write(":KEY:FORCe")  # Unlocks the remote control
-                inst.close()  # Close the connection after getting ID
-
-                # Construct a filename from the instrument ID
-                fn_inst = inst_id.replace(' ', '_').replace(':', '')
-                fn_inst_list = fn_inst.split(',')
-                json_filename = f"{fn_inst_list[0]}_{fn_inst_list[1]}.json"
-                print(f"JSON filename: {json_filename}")
-
-                if os.path.exists(json_filename):
-                    with open(json_filename, 'r') as file:
-                        data = json.load(file)
-                        connect_cmd = data.get("connect")
-                        id_cmd = data.get("id")
-                        close_cmd = data.get("close")
-
-                        # Use the commands (for demonstration, printing them)
-                        print(f"Connect Command: {connect_cmd}")
-                        print(f"ID Command: {id_cmd}")
-                        print(f"Close Command: {close_cmd}")
-
-                        # Create a button with the instrument's info
-                        inst_list = inst_id.split(',')
-                        inst_button = QPushButton(
-                            f"{inst_list[0]} {inst_list[1]}\nS/N: {inst_list[2]}\nVer: {inst_list[3]}")
-                        inst_button.clicked.connect(lambda checked, inst=item: self.select_inst(
-                            f"{inst_id}", connect_cmd, id_cmd, close_cmd))
-                        self.inst_button_container.addWidget(inst_button)
-                else:
-                    print(f"Configuration file {json_filename} not found.")
+            # The handle is taken out of the cache while in use; it's put back if the probe succeeds
+            probe = InstProbe(self._rm, item, self._inst_cache.pop(item, None))
+            probe.signals.found.connect(self.add_inst_button)
+            probe.signals.failed.connect(self.inst_probe_failed)
+            probe.signals.done.connect(self.inst_probe_done)
+            self._inst_probes[item] = probe
+            self._probe_pool.start(probe)
+
+    def add_inst_button(self, item, inst_id, inst):
+        self._inst_cache[item] = inst
+        try:
+            # Construct a filename from the instrument ID
+            fn_inst = inst_id.replace(' ', '_').replace(':', '')
+            fn_inst_list = fn_inst.split(',')
+            json_filename = f"{fn_inst_list[0]}_{fn_inst_list[1]}.json"
+            logger.debug("JSON filename: %s", json_filename)
+
+            data = self._load_inst_config(json_filename)
+            if data is not None:
+                connect_cmd = data.get("connect")
+                id_cmd = data.get("id")
+                close_cmd = data.get("close")
+
+                # Use the commands (for demonstration, logging them)
+                logger.debug("Connect Command: %s", connect_cmd)
+                logger.debug("ID Command: %s", id_cmd)
+                logger.debug("Close Command: %s", close_cmd)
+
+                # Create a button with the instrument's info
+                inst_list = inst_id.split(',')
+                inst_button = QPushButton(
+                    f"{inst_list[0]} {inst_list[1]}\nS/N: {inst_list[2]}\nVer: {inst_list[3]}")
+                inst_button.clicked.connect(lambda checked, inst=item: self.select_inst(
+                    f"{inst_id}", connect_cmd, id_cmd, close_cmd))
+                self.inst_button_container.addWidget(inst_button)
+            else:
+                logger.debug("Configuration file %s not found.", json_filename)
+
+        except Exception as e:
+            self.inst_probe_failed(item, f"Exception: {e}")
+
+    def inst_probe_failed(self, item, error_msg):
+        logger.debug("%s: %s", item, error_msg)
+
+    def inst_probe_done(self, item):
+        self._inst_probes.pop(item, None)
+        if not self._inst_probes:
+            self.search_button.setEnabled(True)
+
+    def _load_inst_config(self, path):
+        """
+        Return the parsed instrument JSON config at path, or None if it doesn't exist.
+        The file is only re-read when its modification time changes.
+        """
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            MainWindow._json_cache.pop(path, None)
+            return None
 
-            except Exception as e:
-                error_msg = f"Exception: {e}"
-                print(error_msg)
+        cached = MainWindow._json_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r') as file:
+            data = json.load(file)
+        MainWindow._json_cache[path] = (mtime, data)
+        return data
 
     def select_inst(self, inst_id, connect_cmd, id_cmd, close_cmd):
         # Example function showing how you might use the commands
-        print(f"Selected: {inst_id}")
-        print(f"Connect Command: {connect_cmd}")
-        print(f"ID Command: {id_cmd}")
-        print(f"Close Command: {close_cmd}")
+        logger.debug("Selected: %s", inst_id)
+        logger.debug("Connect Command: %s", connect_cmd)
+        logger.debug("ID Command: %s", id_cmd)
+        logger.debug("Close Command: %s", close_cmd)
 
         self.status_bar.showMessage(f"Selected instrument: {inst_id}")
 
+    def closeEvent(self, event):
+        # Let any running probes finish before the resource manager goes away
+        self._probe_pool.waitForDone()
+        # Closing the resource manager also closes any handle whose result never reached the cache
+        for inst in self._inst_cache.values():
+            _close_inst(inst)
+        self._inst_cache.clear()
+        if self._rm is not None:
+            self._rm.close()
+        super().closeEvent(event)
+
     def update_status_bar(self, message=None):
         if message:
             self.status_bar.showMessage(message)
         else:
-            total_packets = self.data_table.rowCount()
+            total_packets = self.model.total_rows()
             self.status_bar.showMessage(f"Total packets: {total_packets}")
 
-    def add_data_to_table(self, row_data, adjust_row_height=False):
-        self.data_table.setSortingEnabled(False)
-
-        row = self.data_table.rowCount()
-        self.data_table.insertRow(row)
-
-        # Variable to store the maximum height required for this row
-        max_row_height = 5  # self.data_table.rowHeight(row)
-
-        is_msg_row = False
-
-        for col_index, data_item in enumerate(row_data):
-            if data_item == "Msg":
-                is_msg_row = True
-                MainWindow.messages_count += 1
-
-        for col_index, data_item in enumerate(row_data):
-            item = QTableWidgetItem(str(data_item))
-            item.setTextAlignment(Qt.AlignLeft)
-
-            # Set the item to be non-editable
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-
-            self.data_table.setItem(row, col_index, item)
-
-            # Check if we're in the "Result" column and set background color
-            if col_index == self.columns.index("Result"):
-                if is_msg_row:
-                    # Semi-transparent 'Material' indigo color for "Msg"
-                    item.setBackground(QColor(33, 150, 243, 64))
-                elif data_item == "Pass":
-                    # Semi-transparent 'Material' green color for Pass
-                    item.setBackground(QColor(76, 175, 80, 64))
-                elif data_item == "Fail":
-                    # Semi-transparent 'Material' red color for Fail
-                    item.setBackground(QColor(244, 67, 54, 64))
-
-            # Check if we're in the "Notes" column and if is message row
-            if col_index == self.columns.index("Notes"):
-                if is_msg_row:
-                    # Semi-transparent 'Material' indigo color for "Msg"
-                    item.setBackground(QColor(33, 150, 243, 64))
-
-            # Update the row height if needed
-            if adjust_row_height:
-                self.data_table.resizeRowToContents(row)
-                row_height = self.data_table.rowHeight(row)
-                if row_height > max_row_height:
-                    max_row_height = row_height
-
-        # Set the row to the maximum height required
-        if adjust_row_height:
-            self.data_table.setRowHeight(row, max_row_height)
-
-        self.data_table.setSortingEnabled(True)
-
     def adjust_row_heights(self):
-        for row in range(self.data_table.rowCount()):
-            self.data_table.resizeRowToContents(row)
+        """
+        Grow the rows currently visible in the table whose text wraps, and shrink them back once it no longer does.
+        Single-line rows always keep the shared default height.
+        """
+        viewport = self.data_table.viewport().rect()
+        first = self.data_table.rowAt(viewport.top())
+        if first < 0:
+            return
+        last = self.data_table.rowAt(viewport.bottom())
+        if last < 0:
+            last = self.model.rowCount() - 1
+        vertical_header = self.data_table.verticalHeader()
+        default_height = vertical_header.defaultSectionSize()
+        for row in range(first, last + 1):
+            height = max(self.data_table.sizeHintForRow(row), default_height)
+            if vertical_header.sectionSize(row) != height:
+                self.data_table.setRowHeight(row, height)
+
+    def _forget_selected_row(self):
+        self._last_selected_row = -1
+
+    def _refresh_selected_row(self):
+        """
+        Show the selected record again after a sort has moved it to another row.
+        """
+        had_selection = self._last_selected_row != -1
+        self._last_selected_row = -1
+        if self.data_table.selectionModel().selectedRows():
+            self.update_inst()
+        elif had_selection:
+            # The selected record was sorted beyond the loaded rows
+            self.inst_textbox.clear()
+            self.update_status_bar(
+                f"File: '{self.csv_file_name}'. "
+                f"Total records: {self._total_records_str}."
+            )
 
     def update_inst(self):
         selected_rows = self.data_table.selectionModel().selectedRows()
-        if selected_rows:
+        if not selected_rows:
+            # Re-selecting the same row later must refresh the view again
+            self._last_selected_row = -1
+        else:
+            row = selected_rows[0].row()
+            if row == self._last_selected_row:
+                return
+            self._last_selected_row = row
 
             # Get the "Notes" column cell's text
-            packet_column_index = self.columns.index("Notes")
-            packet_cell = self.data_table.item(
-                selected_rows[0].row(), packet_column_index).text()
+            packet_cell = self.model.index(row, self.model.notes_col).data() or ""
 
             # Get the "Result" column cell's text
-            dir_column_index = self.columns.index("Result")
-            dir_cell = self.data_table.item(
-                selected_rows[0].row(), dir_column_index).text()
+            dir_cell = self.model.index(row, self.model.result_col).data() or ""
             if "Msg" in dir_cell:
                 # Message row, not packet data, so don't attempt parsing.
                 self.inst_textbox.clear()
@@ -301,11 +605,12 @@ class MainWindow(QMainWindow):
 
             # Update status bar with selected packet number and total packets
             # Adding 1 for human-readable numbering (1-indexed)
-            selected_record_num = selected_rows[0].row() + 1
-            total_records = self.data_table.rowCount()
+            selected_record_num = row + 1
+            loaded_records = self.model.rowCount()
             self.update_status_bar(
-                f"File: '{MainWindow.csv_file_name}', "
-                f"Selected record: {selected_record_num:n} of {total_records:n}.")
+                f"File: '{self.csv_file_name}', "
+                f"Selected record: {_fmt_count(selected_record_num)} of {self._total_records_str} "
+                f"({_fmt_count(loaded_records)} of {self._total_records_str} loaded).")
 
     def import_table_from_csv(self):
         """
@@ -316,84 +621,101 @@ class MainWindow(QMainWindow):
         fileName, _ = QFileDialog.getOpenFileName(
             self, "QFileDialog.getOpenFileName()", "", "CSV Files (*.csv);;All Files (*)", options=options)
         if fileName:
-            MainWindow.csv_file_name = os.path.basename(fileName)
+            csv_file_name = os.path.basename(fileName)
             self.inst_textbox.setPlainText(
-                f"Loading file '{MainWindow.csv_file_name}'...")
+                f"Loading file '{csv_file_name}'...")
             self.update_status_bar(
-                f"Loading file '{MainWindow.csv_file_name}'...")
+                f"Loading file '{csv_file_name}'...")
 
             # Force GUI to show our Loading messages.
             QApplication.processEvents()
 
+            # Events are processed while reading, so don't allow a second import to start meanwhile
+            self.import_button.setEnabled(False)
             try:
-                with open(fileName, 'r', newline='') as f:
+                # A 1 MiB read buffer keeps large files to a handful of read calls
+                with open(fileName, 'r', newline='', buffering=1024 * 1024) as f:
                     reader = csv.reader(f)
+                    rows = []
+                    for r, row in enumerate(reader):
+                        rows.append(row)
+                        # Every 1024 rows, keep the GUI painting (but ignore user input) and show progress
+                        if (r & 0x3FF) == 0x3FF:
+                            self.update_status_bar(
+                                f"Loading file '{csv_file_name}'... {_fmt_count(r + 1)} records read")
+                            QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
 
-                    # Clear existing data in the table
-                    self.data_table.clearContents()
-                    self.data_table.setRowCount(0)
-                    MainWindow.invalid_packet_count = 0
-                    MainWindow.messages_count = 0
+                    self.invalid_packet_count = 0
 
                     # Clear the right-pane:
                     self.inst_textbox.clear()
 
+                    # Don't repaint the table until the new rows are in place and sorted
+                    self.data_table.setUpdatesEnabled(False)
                     self.data_table.setSortingEnabled(False)
-                    for row in reader:
-                        self.add_data_to_table(row, False)
-                    self.adjust_row_heights()
-                    self.data_table.setSortingEnabled(True)
-                    # Column index 0 (Time)
-                    self.data_table.sortItems(0, Qt.AscendingOrder)
-
-                    total_records = self.data_table.rowCount()
+                    try:
+                        # Replaces any existing data in the table
+                        self.model.set_rows(rows)
+                        # Only now does the table show the new file; on errors it keeps the previous one
+                        self.csv_file_name = csv_file_name
+                        self.messages_count = self.model.messages_count
+                        # Re-enabling sorting sorts once by the indicator, column index 0 (Time)
+                        self.data_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+                    finally:
+                        self.data_table.setSortingEnabled(True)
+                        self.data_table.setUpdatesEnabled(True)
+                        self.data_table.viewport().update()
+
+                    total_records = self.model.total_rows()
+                    self._total_records_str = _fmt_count(total_records)
                     self.inst_textbox.setPlainText(
-                        f"File: '{MainWindow.csv_file_name}' successfully imported\n\n"
-                        f"- Total records:   {total_records:8n}\n"
+                        f"File: '{csv_file_name}' successfully imported\n\n"
+                        f"- Total records:   {_fmt_count(total_records):>8}\n"
                     )
                     self.update_status_bar(
-                        f"File: '{MainWindow.csv_file_name}'. "
-                        f"Total records: {total_records:n}."
+                        f"File: '{csv_file_name}'. "
+                        f"Total records: {self._total_records_str}."
                     )
 
             except csv.Error as e:
                 error_msg = f"Error reading CSV file at line {reader.line_num}: {e}"
-                print(error_msg)
+                logger.debug(error_msg)
                 self.inst_textbox.setPlainText(
-                    f"ERROR! File: '{MainWindow.csv_file_name}'\n\n"
+                    f"ERROR! File: '{csv_file_name}'\n\n"
                     f"- {error_msg}"
                 )
                 self.update_status_bar(error_msg)
 
             except FileNotFoundError as e:
                 error_msg = f"File not found: {e}"
-                print(error_msg)
+                logger.debug(error_msg)
                 self.inst_textbox.setPlainText(
-                    f"ERROR! File: '{MainWindow.csv_file_name}'\n\n"
+                    f"ERROR! File: '{csv_file_name}'\n\n"
                     f"- {error_msg}"
                 )
                 self.update_status_bar(error_msg)
 
             except ValueError as e:
                 error_msg = f"ValueError: {e}"
-                print(e)
-                print(error_msg)
+                logger.debug(error_msg)
                 self.inst_textbox.setPlainText(
-                    f"ERROR! File: '{MainWindow.csv_file_name}'\n\n"
+                    f"ERROR! File: '{csv_file_name}'\n\n"
                     f"- {error_msg}"
                 )
                 self.update_status_bar(error_msg)
 
             except Exception as e:
                 error_msg = f"Exception: {e}"
-                print(e)
-                print(error_msg)
+                logger.debug(error_msg)
                 self.inst_textbox.setPlainText(
-                    f"ERROR! File: '{MainWindow.csv_file_name}'\n\n"
+                    f"ERROR! File: '{csv_file_name}'\n\n"
                     f"- {error_msg}"
                 )
                 self.update_status_bar(error_msg)
 
+            finally:
+                self.import_button.setEnabled(True)
+
 
 app = QApplication([])
 window = MainWindow()